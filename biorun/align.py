@@ -1,5 +1,7 @@
+import functools
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from itertools import *
 
 from biorun import parser, convert
@@ -7,7 +9,6 @@ from biorun.libs import placlib as plac
 from . import models
 
 try:
-    from Bio import SeqIO
     from Bio.Seq import Seq
     from Bio.SeqRecord import SeqRecord
     from Bio.Align import PairwiseAligner
@@ -26,27 +27,18 @@ LOCAL_ALIGN, GLOBAL_ALIGN, SEMIGLOBAL_ALIGN = "local", "global", "semiglobal"
 
 NUCLEOTIDE, PEPTIDE = "nucleotide", "peptide"
 
-NUCS = set("ATGC" + 'atgc')
-PEPS = set("ACDEFGHIKLMNPQRSTVWY")
-RNAS = set("AUGC" + 'augc')
+# Alignments with more dynamic programming cells than this are run in parallel.
+PARALLEL_CELLS = 10 ** 7
 
+# Alignment settings used by the current process.
+SHARED = {}
 
-def is_nuc(c):
-    return c in NUCS
-
-
-def is_prot(c):
-    return c in PEPS
-
-
-def all_pep(text, limit=1000):
-    subs = text[:limit]
-    return all(map(is_prot, subs))
-
-
-def all_nuc(text, limit=1000):
-    subs = text[:limit]
-    return all(map(is_nuc, subs))
+# The aligner mode for each alignment type. Global and semiglobal differ only in end gap scoring.
+ALIGNER_MODE = {
+    LOCAL_ALIGN: 'local',
+    GLOBAL_ALIGN: 'global',
+    SEMIGLOBAL_ALIGN: 'global',
+}
 
 
 def safe_abs(value):
@@ -56,33 +48,34 @@ def safe_abs(value):
         utils.error(f"{exc} {value}")
 
 
-def align(target, query, par: models.Param):
-    # Query and target sequences.
-    t = str(target.seq).upper()
-    q = str(query.seq).upper()
-
-    aligner = PairwiseAligner()
-
-    # Select local mode. Global, semiglobal are about scoring.
-    if par.mode == LOCAL_ALIGN:
-        aligner.mode = 'local'
-    else:
-        aligner.mode = 'global'
-
+def select_matrix(seq, par: models.Param):
+    """
+    Detects the sequence type and selects the substitution matrix name.
+    """
     # Recognize a few shorter matrix names.
     par.matrix = 'NUC.4.4' if par.matrix in ('DNA', 'EDNAFULL') else par.matrix
     par.matrix = 'BLOSUM62' if par.matrix in ('PROT', 'PEP') else par.matrix
 
     # Automatic detection of nucleotide vs peptide
-    par.is_dna = all_nuc(t)
+    par.is_dna = parser.all_nuc(seq)
 
     # Peptides get the BLOSUM matrix as default.
     if not par.matrix and not par.is_dna:
         par.matrix = "BLOSUM62"
 
-    if par.matrix:
-        # Load the substitutions matrix
-        aligner.substitution_matrix = get_matrix(par.matrix)
+
+def get_aligner(par: models.Param, matrix=None):
+    """
+    Creates a pairwise aligner from the alignment parameters.
+    """
+    aligner = PairwiseAligner()
+
+    # Select local mode. Global, semiglobal are about scoring.
+    aligner.mode = ALIGNER_MODE.get(par.mode, 'global')
+
+    if matrix is not None:
+        # The substitutions matrix
+        aligner.substitution_matrix = matrix
     else:
         # Nucleotide defaults.
         aligner.match_score = safe_abs(par.match)
@@ -102,21 +95,29 @@ def align(target, query, par: models.Param):
         aligner.target_end_gap_score = 0.0
         aligner.query_end_gap_score = 0.0
 
-    # Performs the alignment
-    alns = aligner.align(t, q)
+    return aligner
 
-    return alns
+
+@functools.lru_cache(maxsize=None)
+def load_matrix(matrix):
+    """
+    Loads a substitution matrix by name or from a file. Each matrix is parsed only once.
+    """
+    if os.path.isfile(matrix):
+        return substitution_matrices.read(matrix)
+    else:
+        return substitution_matrices.load(matrix)
 
 
 def get_matrix(matrix, show=False):
     try:
 
+        mat = load_matrix(matrix)
+
         if os.path.isfile(matrix):
             if show:
                 print(open(matrix).read(), end='')
-            mat = substitution_matrices.read(matrix)
         else:
-            mat = substitution_matrices.load(matrix)
             if show:
                 path = os.path.dirname(os.path.realpath(substitution_matrices.__file__))
                 path = os.path.join(path, "data", matrix)
@@ -130,6 +131,103 @@ def get_matrix(matrix, show=False):
     return mat
 
 
+def set_shared(data):
+    """
+    Stores the settings shared by all alignments in the current process.
+    """
+    SHARED.update(data)
+
+
+def count_occurrences(text, word, limit=1000):
+    """
+    Counts the possibly overlapping occurrences of a word in a text, up to a limit.
+    """
+    num, pos = 0, text.find(word)
+    while pos >= 0 and num < limit:
+        num += 1
+        pos = text.find(word, pos + 1)
+    return num
+
+
+def exact_match(aligner, qseq, tseq):
+    """
+    Returns the score and the number of other identically scoring alignments when
+    the best alignment is an exact match of the query. Returns None otherwise.
+    """
+    # Only match/mismatch scoring guarantees that an exact match is the best alignment.
+    if not qseq or aligner.substitution_matrix is not None or aligner.match_score <= 0:
+        return None
+
+    score = aligner.match_score * len(qseq)
+
+    # Identical sequences have a single best alignment.
+    if qseq == tseq:
+        return score, 0
+
+    # In local mode a query found in the target aligns to each copy of itself.
+    if aligner.mode == 'local' and aligner.open_gap_score < 0 and qseq in tseq:
+        return score, count_occurrences(tseq, qseq) - 1
+
+    return None
+
+
+def score_pair(task):
+    """
+    Scores a query against the target.
+    """
+    qseq = task[2]
+
+    match = exact_match(SHARED['aligner'], qseq, SHARED['tseq'])
+    if match:
+        return match[0]
+
+    return SHARED['aligner'].score(qseq, SHARED['tseq'])
+
+
+def align_pair(task):
+    """
+    Aligns a query to the target. Returns the alignments and the number of other identically scoring alignments.
+    """
+    qid, qname, qseq = task
+
+    # Exact matches are known without running the alignment.
+    match = exact_match(SHARED['aligner'], qseq, SHARED['tseq'])
+
+    if match:
+        score, num = match
+        alns = pairs = repeat((qseq, qseq, score), num + 1)
+    else:
+        # Performs the alignment
+        alns = SHARED['aligner'].align(qseq, SHARED['tseq'])
+
+        # Limit the number of alignments
+        alns = islice(alns, 1000)
+
+        # Unpack the BioPython pairwise results.
+        pairs = ((aln[0], aln[1], aln.score) for aln in alns)
+
+    collect = []
+    for seq1, seq2, score in pairs:
+
+        # Wrap the resulting alignment into a sequence.
+        query_aln = SeqRecord(id=qid, name=qname, description='', seq=Seq(seq1))
+        target_aln = SeqRecord(id=SHARED['tid'], name=SHARED['tname'], description='', seq=Seq(seq2))
+
+        # Pack all content into the representation.
+        obj = models.Alignment(query=query_aln, target=target_aln, score=score)
+
+        collect.append(obj)
+
+        # Keep the first alignment only
+        if not SHARED['all_']:
+            break
+
+    # Count the remaining alignments.
+    count = sum(1 for x in alns)
+
+    return collect, count
+
+
 @plac.pos("sequence", "sequences")
 @plac.opt("open_", "gap open penalty", type=int, abbrev='o')
 @plac.opt("extend", "gap extend penalty", type=float, abbrev='x')
@@ -146,8 +244,10 @@ def get_matrix(matrix, show=False):
 @plac.flg("global_", "local alignment", abbrev='G')
 @plac.flg("semiglobal", "local alignment", abbrev='S')
 @plac.flg("all_", "show all alignments", abbrev='A')
+@plac.flg("score", "output alignment scores only", abbrev='s')
 def run(open_=11, extend=1, matrix='', local_=False, global_=False, match=1, mismatch=2,
-        semiglobal=False, vcf=False, table=False, diff=False, pile=False, fasta=False, all_=False, *sequences):
+        semiglobal=False, vcf=False, table=False, diff=False, pile=False, fasta=False, all_=False, score=False,
+        *sequences):
     # Select alignment mode
     if global_:
         mode = GLOBAL_ALIGN
@@ -178,6 +278,9 @@ def run(open_=11, extend=1, matrix='', local_=False, global_=False, match=1, mis
     # The first sequence is the query
     target = recs[0]
 
+    # Uppercase sequence strings are made once and reused in every alignment.
+    seqs = [str(rec.seq).upper() for rec in recs]
+
     # Resulting alignments
     collect = []
 
@@ -190,40 +293,55 @@ def run(open_=11, extend=1, matrix='', local_=False, global_=False, match=1, mis
         mismatch=mismatch,
     )
 
+    # The sequence type and the matrix are selected once, based on the first query.
+    select_matrix(seqs[1], par=par)
+
+    # Load the substitution matrix.
+    submat = get_matrix(par.matrix) if par.matrix else None
+
+    # A single aligner is used for all alignments.
+    aligner = get_aligner(par, matrix=submat)
+
     # Keeping people from accidentally running alignments that are too large.
     MAXLEN = 50000
 
-    # Generate an alignment for each target
     for query in recs[1:]:
-
         if (len(query.seq) > MAXLEN) and (len(target.seq) > MAXLEN):
             utils.error(f"Both sequences {query.id} and {target.id} appear to be longer than {MAXLEN:,} bases.", stop=False)
             utils.error("We recommend that you use a different software.")
 
-        alns = align(query, target, par=par)
+    # The settings shared by all alignments.
+    shared = dict(aligner=aligner, tid=target.id, tname=target.name, tseq=seqs[0], all_=all_)
 
-        alns = islice(alns, 1000)
+    # One task for each query.
+    tasks = [(query.id, query.name, qseq) for query, qseq in zip(recs[1:], seqs[1:])]
 
-        for aln in alns:
+    # Scoring does not need the traceback.
+    func = score_pair if score else align_pair
 
-            # Unpack a BioPython pairwise result.
-            seq1, seq2 = Seq(aln[0]), Seq(aln[1])
-
-            # Wrap the resulting alignment into a sequence.
-            query_aln = SeqRecord(id=query.id, name=query.name, description='', seq=seq1)
-            target_aln = SeqRecord(id=target.id, name=target.name, description='', seq=seq2)
-
-            # Pack all content into the representation.
-            obj = models.Alignment(query=query_aln, target=target_aln, score=aln.score)
+    # Larger jobs are spread over multiple processes.
+    cells = len(seqs[0]) * sum(map(len, seqs[1:]))
+    workers = min(len(tasks), os.cpu_count() or 1)
+    if workers > 1 and cells > PARALLEL_CELLS:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=set_shared, initargs=(shared,)) as pool:
+            results = list(pool.map(func, tasks, chunksize=chunksize))
+    else:
+        set_shared(shared)
+        results = list(map(func, tasks))
 
-            # Collect all alignments into a datastructure
-            collect.append(obj)
+    if score:
+        print("target\tquery\tscore")
+        for (qid, qname, qseq), value in zip(tasks, results):
+            print(f"{target.name}\t{qname}\t{value}")
+        return
 
-            # Keep the first alignment only
-            if not all_:
-                break
+    # Number of identically scoring alignments for the last query.
+    count = 0
 
-        count = sum(1 for x in alns)
+    # Collect all alignments into a datastructure
+    for alns, count in results:
+        collect.extend(alns)
 
     # Select formatting mode
     if vcf:
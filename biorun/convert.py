@@ -4,7 +4,7 @@ Converts across formats
 import re, os
 import sys
 import string
-from itertools import count
+from itertools import chain, count
 from biorun import utils, parser
 import json
 
@@ -177,17 +177,16 @@ def get_params(rec, hasN=False):
 
     # text = json.dumps(ann, indent=4)
     # print (text)
-    if hasN:
-        nfunc = lambda rec: rec.seq.count('N')
-    else:
-        nfunc = lambda rec: 0
+
+    # Parent annotations are read directly.
+    parent, first = rec.parent, parser.first
 
     params = dict(
-        isolate=rec.get_parent_ann("isolate"),
-        country=rec.get_parent_ann("country"),
-        date=rec.get_parent_ann("collection_date"),
-        pub_date=rec.get_parent_ann("date"),
-        host=rec.get_parent_ann("host"),
+        isolate=first(parent, "isolate"),
+        country=first(parent, "country"),
+        date=first(parent, "collection_date"),
+        pub_date=first(parent, "date"),
+        host=first(parent, "host"),
         gene=rec.gene,
         type=rec.type,
         product=rec.product,
@@ -195,7 +194,7 @@ def get_params(rec, hasN=False):
         source=rec.source,
         id=rec.id,
         count=next(COUNTER),
-        N=nfunc(rec),
+        N=rec.seq.count('N') if hasN else 0,
     )
     return params
 
@@ -405,8 +404,11 @@ def run(protein=False, translate=False, fasta=False, revcomp=False, features=Fal
     # Get a stream of
     recs = parser.get_records(fnames)
 
-    if len(recs) < 1:
+    # The records are generated lazily, check that there is at least one.
+    first = next(recs, None)
+    if first is None:
         utils.error("no sequence records found in data")
+    recs = chain([first], recs)
 
     recs = map(remapper, recs)
 
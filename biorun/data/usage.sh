@@ -90,6 +90,9 @@ bio align GATTACA GATCA --vcf > align_default.vcf
 # Running variants.
 bio align GATTACA GATCA --diff  > align_default.diff
 
+# Alignment scores only.
+bio align GATTACA GATCA --score > align_score.txt
+
 # Running on FASTA files.
 bio align align_input.fa --vcf > align_input.vcf
 
@@ -1,5 +1,5 @@
 import csv
-import re
+import shutil
 import sys
 
 try:
@@ -15,6 +15,7 @@ from biorun.api import ena_fastq
 
 from biorun.libs import placlib as plac
 from tqdm import tqdm
+from tqdm.utils import CallbackIOWrapper
 from biorun import utils
 from urllib.error import HTTPError
 import requests
@@ -23,6 +24,9 @@ Entrez.email = 'foo@foo.com'
 
 logger = utils.logger
 
+# Block size used when copying downloads to the output.
+CHUNK_SIZE = 64 * 1024
+
 
 #
 # Genbank and Refseq accession numbers
@@ -35,9 +39,7 @@ logger = utils.logger
 
 
 def parse_ensmbl(text):
-    patt = r'(?P<letters>[a-zA-Z]+)(?P<digits>\d+)(\.(?P<version>\d+))?'
-    patt = re.compile(patt)
-    m = patt.search(text)
+    m = patterns.ENSEMBL_PATT.search(text)
     code = m.group("letters") if m else ''
     digits = m.group("digits") if m else ''
     version = m.group("version") if m else ''
@@ -45,9 +47,7 @@ def parse_ensmbl(text):
 
 
 def parse_ncbi(text):
-    patt = r'(?P<letters>[a-zA-Z]+)(?P<under>_?)(?P<digits>\d+)(\.(?P<version>\d+))?'
-    patt = re.compile(patt)
-    m = patt.search(text)
+    m = patterns.NCBI_PATT.search(text)
     code = m.group("letters") if m else ''
     digits = m.group("digits") if m else ''
     refseq = m.group("under") if m else ''
@@ -101,6 +101,28 @@ def is_ncbi_protein(text):
     return cond
 
 
+# The kinds of accession numbers that can be fetched.
+SRR, ENSEMBL, GCF, NUCLEOTIDE, PROTEIN = "srr", "ensembl", "gcf", "nucleotide", "protein"
+
+
+def classify(text):
+    """
+    Returns the kind of an accession number or None if it is not recognized.
+    """
+    if patterns.is_srr(text):
+        return SRR
+    elif is_ensembl(text):
+        return ENSEMBL
+    elif is_GCF(text):
+        return GCF
+    elif is_ncbi_nucleotide(text):
+        return NUCLEOTIDE
+    elif is_ncbi_protein(text):
+        return PROTEIN
+    else:
+        return None
+
+
 def efetch(ids, db, rettype, retmode, limit=None):
     """
     Fetches data from GenBank
@@ -218,19 +240,19 @@ def fetch_ncbi(ids, db, rettype='gbwithparts', retmode='text', limit=None):
         stream = Entrez.efetch(db=db, id=ids, rettype=rettype, retmode=retmode, retmax=limit)
 
         try:
-            stream = tqdm(stream, unit='B', unit_divisor=1024, desc='# downloaded', unit_scale=True, delay=5,
-                          leave=False)
+            progress = tqdm(unit='B', unit_divisor=1024, desc='# downloaded', unit_scale=True, delay=5,
+                            leave=False)
         except Exception as exc:
             # Older version of tqdm does not have the delay parameter.
-            stream = tqdm(stream, unit='B', unit_divisor=1024, desc='# downloaded', unit_scale=True, leave=False)
+            progress = tqdm(unit='B', unit_divisor=1024, desc='# downloaded', unit_scale=True, leave=False)
 
     except Exception as exc:
         utils.error(f"Error for {ids}, {db}, {rettype}, {retmode}: {exc}")
 
-    for line in stream:
-        print(line, end='')
-        stream.update(len(line))
-    stream.close()
+    # Copy the data in large blocks, the progress bar is updated on each read.
+    stream = CallbackIOWrapper(progress.update, stream, "read")
+    shutil.copyfileobj(stream, sys.stdout, CHUNK_SIZE)
+    progress.close()
 
 
 def fetch_gcf(ids, format_=''):
@@ -303,35 +325,30 @@ def run(db="", type_='', format_='', limit=100, out='', *acc):
         lines = utils.read_lines(sys.stdin, sep=None)
         ids.extend(lines)
 
-    srrs = list(map(patterns.is_srr, ids))
-    if all(srrs):
+    # Classify each accession number once.
+    kinds = set(map(classify, ids))
+
+    # Dealing with SRR numbers
+    if kinds <= {SRR}:
         for srr in ids:
             ena_fastq.run(srr=srr, out=out, limit=limit)
         return
 
     # Dealing with Ensembl
-    ensmbl = list(map(is_ensembl, ids))
-    if all(ensmbl):
+    if kinds == {ENSEMBL}:
         fetch_ensembl(ids=ids, ftype=type_)
         return
 
     # Downloads GCF data
-    gcfs = list(map(is_GCF, ids))
-    if all(gcfs):
+    if kinds == {GCF}:
         fetch_gcf(ids=ids, format_=format_)
         return
 
-    # Detects nucleotides
-    nucs = list(map(is_ncbi_nucleotide, ids))
-
-    # Detects proteins
-    prots = list(map(is_ncbi_protein, ids))
-
-    if any(prots) and any(nucs):
+    if PROTEIN in kinds and NUCLEOTIDE in kinds:
         utils.error(f"input mixes protein and nucleotide entries: {ids}")
 
     # Select protein database
-    if all(prots):
+    if kinds == {PROTEIN}:
         default = "protein"
     else:
         default = "nuccore"
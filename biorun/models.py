@@ -1,25 +1,38 @@
 import sys
 from itertools import *
 
+import numpy as np
 from Bio import SeqIO
 from Bio.SeqRecord import SeqRecord
 
+# Byte code of the gap character.
+GAP = ord('-')
 
-def positions(query, target):
-    pos = dict()
 
-    posa = posb = 0
+def as_array(seq):
+    """
+    Returns the characters of a sequence as an array of byte codes.
+    """
+    return np.frombuffer(str(seq).encode("ascii", errors="replace"), dtype=np.uint8)
 
-    for a, b in zip(query, target):
 
-        if a != b:
-            pos[posb] = posa
+def positions(query, target):
+    """
+    Maps target coordinates to query coordinates at the mismatching columns.
+    """
+    qarr, tarr = as_array(query.seq), as_array(target.seq)
 
-        if a != '-':
-            posa += 1
+    size = min(len(qarr), len(tarr))
+    qarr, tarr = qarr[:size], tarr[:size]
 
-        if b != '-':
-            posb += 1
+    # The number of bases that precede each column.
+    qbases, tbases = qarr != GAP, tarr != GAP
+    posa = np.cumsum(qbases) - qbases
+    posb = np.cumsum(tbases) - tbases
+
+    # Later columns overwrite earlier ones with the same target coordinate.
+    cols = np.flatnonzero(qarr != tarr)
+    pos = dict(zip(posb[cols].tolist(), posa[cols].tolist()))
 
     return pos
 
@@ -39,29 +52,32 @@ class Alignment:
         self.ident = self.ins = self.dels = self.mis = 0
         self.score = score
 
+        # The aligned sequences as byte codes.
+        qarr, tarr = as_array(self.query.seq), as_array(self.target.seq)
+
         # Query and target lengths.
-        self.qlen = sum(1 for x in self.query.seq if x != '-')
-        self.tlen = sum(1 for x in self.target.seq if x != '-')
+        self.qlen = int(np.count_nonzero(qarr != GAP))
+        self.tlen = int(np.count_nonzero(tarr != GAP))
 
-        # Compute alignment information.
-        for a, b in zip(self.query, self.target):
-            if a == '-' and b == '-':
-                continue
-            elif a == b:
-                self.ident += 1
-            elif a == '-':
-                self.dels += 1
-            elif b == '-':
-                self.ins += 1
-            elif a != b:
-                self.mis += 1
+        # Compute alignment information over the aligned columns.
+        size = min(len(qarr), len(tarr))
+        qarr, tarr = qarr[:size], tarr[:size]
+        qgap, tgap, same = qarr == GAP, tarr == GAP, qarr == tarr
+
+        # Code each column, then tally the codes in a single pass:
+        # 0=mismatch, 1=deletion, 2=insertion, 4=identity, 7=gap in both (skipped)
+        kind = same.view(np.uint8) * 4 + qgap.view(np.uint8) + tgap.view(np.uint8) * 2
+        counts = np.bincount(kind, minlength=8)
+
+        self.mis, self.dels, self.ins, self.ident = map(int, counts[[0, 1, 2, 4]])
 
         # Maps the positions between the two sequences
         self.pos = positions(query=self.query, target=self.target)
 
         # Percent identity (BLAST identity)
         # https://lh3.github.io/2018/11/25/on-the-definition-of-sequence-identity
-        self.pident = self.ident / (self.ident + self.mis + self.dels + self.ins) * 100
+        total = self.ident + self.mis + self.dels + self.ins
+        self.pident = self.ident / total * 100 if total else 0.0
 
         self.alen = len(self.target.seq)
 
@@ -326,10 +342,35 @@ def format_pile(alns):
         print("\t".join(out))
 
 
+def make_trace(seq1, seq2):
+    """
+    Marks the identities (|), gaps (-) and mismatches (.) between two aligned sequences.
+    """
+    arr1, arr2 = as_array(seq1), as_array(seq2)
+
+    size = min(len(arr1), len(arr2))
+    arr1, arr2 = arr1[:size], arr2[:size]
+
+    trace = np.full(size, ord('.'), dtype=np.uint8)
+    trace[(arr1 == GAP) | (arr2 == GAP)] = ord('-')
+    trace[arr1 == arr2] = ord('|')
+
+    return trace.tobytes().decode("ascii")
+
+
 def format_pairwise(alns, par=None, width=81):
     """
     Formats an alignment in pairwise mode
     """
+
+    # The parameter line is the same for all alignments, only the score changes.
+    if par:
+        head = f"# {par.mode}: "
+        if par.matrix:
+            tail = f" matrix={par.matrix} gapopen={par.gap_open} gapextend={par.gap_extend}"
+        else:
+            tail = f" match={par.match} mismatch={par.mismatch} gapopen={par.gap_open} gapextend={par.gap_extend}"
+
     for aln in alns:
 
         out = [
@@ -340,33 +381,20 @@ def format_pairwise(alns, par=None, width=81):
 
         if par:
             score = f"score={aln.score}" if aln.score is not None else ''
-            if par.matrix:
-                elem = f"# {par.mode}: {score} matrix={par.matrix} gapopen={par.gap_open} gapextend={par.gap_extend}"
-            else:
-                elem = f"# {par.mode}: {score} match={par.match} mismatch={par.mismatch} gapopen={par.gap_open} gapextend={par.gap_extend}"
-            out.append(elem)
+            out.append(f"{head}{score}{tail}")
 
         out.append("")
 
-        # Generate the traces
-        for start in range(0, len(aln.target.seq), width):
+        # The aligned sequences and the trace are built once then sliced.
+        seq1, seq2 = str(aln.target.seq), str(aln.query.seq)
+        trace = make_trace(seq1, seq2)
+
+        for start in range(0, len(seq1), width):
             end = start + width
 
-            seq1 = aln.target.seq[start:end]
-            seq2 = aln.query.seq[start:end]
-
-            trace = ""
-            for a, b in zip(seq1, seq2):
-                if a == b:
-                    trace += '|'
-                elif a == '-' or b == '-':
-                    trace += '-'
-                else:
-                    trace += '.'
-
-            out.append(str(seq1))
-            out.append(trace)
-            out.append(str(seq2))
+            out.append(seq1[start:end])
+            out.append(trace[start:end])
+            out.append(seq2[start:end])
             out.append("")
 
         print("\n".join(out))
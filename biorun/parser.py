@@ -1,6 +1,4 @@
-import functools
 import io
-import operator
 import os
 import sys
 import gzip
@@ -28,6 +26,10 @@ NUCS = set("ATGC" + 'atgc')
 PEPS = set("ACDEFGHIKLMNPQRSTVWY")
 RNAS = set("AUGC" + 'augc')
 
+# Translation tables that delete the valid characters.
+DELETE_NUCS = str.maketrans('', '', ''.join(NUCS))
+DELETE_PEPS = str.maketrans('', '', ''.join(PEPS))
+
 NUCLEOTIDE, PEPTIDE = "nucleotide", "peptide"
 
 SOURCE, FEATURES, RECORD, ID = "source", "features", "record", "id",
@@ -40,6 +42,13 @@ SEQUENCE_ONTOLOGY = {
     "mat_peptide": "mature_protein_region",
 }
 
+# Annotations that name a feature, tried in order for each feature type.
+NAME_KEYS = {
+    "gene": ("gene", "locus_tag"),
+    "CDS": ("protein_id",),
+    "mRNA": ("transcript_id", "gene"),
+}
+
 counter = count(1)
 
 UNIQUE = defaultdict(int)
@@ -55,12 +64,12 @@ def is_prot(c):
 
 def all_pep(text, limit=1000):
     subs = text[:limit]
-    return all(map(is_prot, subs))
+    return not subs.translate(DELETE_PEPS)
 
 
 def all_nuc(text, limit=1000):
     subs = text[:limit]
-    return all(map(is_nuc, subs))
+    return not subs.translate(DELETE_NUCS)
 
 
 def is_sequence(text):
@@ -72,47 +81,50 @@ def is_sequence(text):
         return None
 
 
-class Peeker:
-    def __init__(self, stream):
+class Prefixed(io.RawIOBase):
+    """
+    A binary stream that serves bytes already read from a stream, then the rest of the stream.
+    """
+
+    def __init__(self, prefix, stream):
+        self.prefix = prefix
         self.stream = stream
-        self.buffer = io.StringIO()
 
-    def peek(self):
-        try:
-            content = next(self.stream)
-        except StopIteration:
-            content = ''
-        self.buffer = io.StringIO(content)
-        return content
-
-    def read(self, size=None):
-        if size is None:
-            return self.buffer.read() + self.stream.read()
-        content = self.buffer.read(size)
-        if len(content) < size:
-            content += self.stream.read(size - len(content))
-        return content
-
-    def readline(self):
-        line = self.buffer.readline()
-        if not line.endswith('\n'):
-            line += self.stream.readline()
-        return line
-
-    def __iter__(self):
-        data = self.buffer.read()
-        if data:
-            yield data
-        else:
-            for line in self.stream:
-                yield line
+    def readable(self):
+        return True
 
-    def __next__(self):
-        data = self.buffer.read() or next(self.stream)
-        if not data:
-            raise StopIteration
-        else:
-            return data
+    def readinto(self, buf):
+        if self.prefix:
+            size = min(len(buf), len(self.prefix))
+            buf[:size], self.prefix = self.prefix[:size], self.prefix[size:]
+            return size
+        return self.stream.buffer.readinto(buf)
+
+
+def peek(stream, size=1024):
+    """
+    Returns the beginning of a text stream and the stream to continue reading from.
+    """
+    buffer = getattr(stream, "buffer", None)
+
+    if hasattr(buffer, "peek"):
+        # Files and stdin are backed by a buffered reader.
+        data = buffer.peek(size)[:size]
+
+        # Pipes may not have the full first line available yet.
+        if data and b"\n" not in data and not buffer.seekable():
+            data = buffer.readline(size)
+            raw = Prefixed(data, stream)
+            stream = io.TextIOWrapper(io.BufferedReader(raw), encoding=stream.encoding, errors=stream.errors)
+
+        text = data.decode("utf-8", errors="ignore")
+    else:
+        # In memory streams are rewound after reading.
+        pos = stream.tell()
+        text = stream.read(size)
+        stream.seek(pos)
+
+    return text, stream
 
 
 def get_streams(fnames, dynamic=False):
@@ -187,8 +199,9 @@ def parse_stream(stream):
     """
     Guesses the type of input and parses the stream into a BioPython SeqRecord.
     """
-    stream = Peeker(stream)
-    first = stream.peek().strip()
+    text, stream = peek(stream)
+    lines = text.splitlines()
+    first = lines[0].strip() if lines else ''
     start = first[0] if first else ''
     if start == '>':
         format = 'fasta'
@@ -212,7 +225,7 @@ def parse_stream(stream):
 
 
 def flatten(nested):
-    return functools.reduce(operator.iconcat, nested, [])
+    return chain.from_iterable(nested)
 
 
 def json_ready(value):
@@ -220,22 +233,24 @@ def json_ready(value):
     Recursively serializes values to types that can be turned into JSON.
     """
 
-    # The type of of the incoming value.
-    curr_type = type(value)
+    # Find the converter for the type of the incoming value.
+    func = JSON_READY.get(type(value))
+
+    return func(value) if func else value
+
 
+# Converters for the types that need to be serialized.
+JSON_READY = {
     # Reference types will be dictionaries.
-    if curr_type == Reference:
-        return dict(title=value.title, authors=value.authors, journal=value.journal, pubmed_id=value.pubmed_id)
+    Reference: lambda value: dict(title=value.title, authors=value.authors, journal=value.journal,
+                                  pubmed_id=value.pubmed_id),
 
     # Serialize each element of the list.
-    if curr_type == list:
-        return [json_ready(x) for x in value]
+    list: lambda value: [json_ready(x) for x in value],
 
     # Serialize the values of an Ordered dictionary.
-    if curr_type == OrderedDict:
-        return dict((k, json_ready(v)) for (k, v) in value.items())
-
-    return value
+    OrderedDict: lambda value: dict((k, json_ready(v)) for (k, v) in value.items()),
+}
 
 
 def next_count(ftype):
@@ -271,12 +286,11 @@ def generate_uid(ftype, ann, description=''):
 
     data = dict(type=ftype, gene=gene, product=prod, locus=locus)
 
-    if ftype == 'gene':
-        name = first(ann, "gene") or locus
-    elif ftype == 'CDS':
-        name = first(ann, "protein_id")
-    elif ftype == 'mRNA':
-        name = first(ann, "transcript_id") or first(ann, "gene") or ''
+    # The first non-empty naming annotation for the feature type.
+    for key in NAME_KEYS.get(ftype, ()):
+        name = first(ann, key)
+        if name:
+            break
 
     name = name or next_count(ftype)
 
@@ -8,3 +8,9 @@ SRR_PATT = re.compile(r'(ERR|SRR|DRR|SRP|ERP)\d+')
 
 # function that matches SRR numbers
 is_srr = lambda text: bool(SRR_PATT.fullmatch(text))
+
+# Match for Ensembl accessions: ENST00000288602.11
+ENSEMBL_PATT = re.compile(r'(?P<letters>[a-zA-Z]+)(?P<digits>\d+)(\.(?P<version>\d+))?')
+
+# Match for NCBI accessions: NC_045512.2
+NCBI_PATT = re.compile(r'(?P<letters>[a-zA-Z]+)(?P<under>_?)(?P<digits>\d+)(\.(?P<version>\d+))?')
@@ -2,6 +2,7 @@ import csv
 import json
 import re
 import sys, os
+import textwrap
 
 import requests
 
@@ -359,6 +360,23 @@ def dispatch(word, all=False, fields='', limit=5, species='', scopes=''):
     return values, warn
 
 
+def print_json(items, indent=4):
+    """
+    Prints items as a JSON list, one element at a time.
+    """
+    pad = " " * indent
+    start = "["
+    for item in items:
+        text = json.dumps(item, indent=indent)
+        text = textwrap.indent(text, pad)
+        sys.stdout.write(f"{start}\n{text}")
+        start = ","
+
+    # Same output as json.dumps on the full list.
+    end = "\n]" if start == "," else "[]"
+    print(end)
+
+
 @plac.flg('csv_', "produce comma separated output")
 @plac.flg('tab', "produce tab separated output")
 @plac.flg('all', "get all possible fields")
@@ -382,15 +400,17 @@ def run(all=False, csv_=False, tab=False, header=False, species='', scopes='symb
 
     sep = "\t" if tab else sep
 
-    collect = []
     warns = []
 
-    for word in words:
-        values, warn = dispatch(word, all=all, limit=limit, fields=fields, species=species, scopes=scopes)
-        collect.extend(values)
-        warns.append(warn)
+    def generate():
+        # Yields the results for each word in turn.
+        for word in words:
+            values, warn = dispatch(word, all=all, limit=limit, fields=fields, species=species, scopes=scopes)
+            warns.append(warn)
+            yield from values
 
     if sep:
+        collect = list(generate())
         fields = collect[0].keys()
         wrt = csv.writer(sys.stdout, delimiter=sep, lineterminator=os.linesep)
         #wrt.writerow(fields)
@@ -400,8 +420,7 @@ def run(all=False, csv_=False, tab=False, header=False, species='', scopes='symb
             wrt.writerow(keys[0])
         wrt.writerows(stream)
     else:
-        text = json.dumps(collect, indent=4)
-        print(text)
+        print_json(generate())
 
     # Show collected warnings at the end where it is not so easy to miss.
     warns = filter(None, warns)